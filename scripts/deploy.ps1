@@ -17,7 +17,7 @@ Write-Host "🚀 Deploying $ProjectName-$Environment infrastructure..." -Foregro
 Set-Location (Join-Path (Split-Path $PSScriptRoot -Parent) "")
 Write-Host "📦 Creating Lambda deployment package..." -ForegroundColor Gray
 if (Test-Path "lambda-deployment.zip") { Remove-Item "lambda-deployment.zip" }
-Compress-Archive -Path "main.py", "requirements.txt", "static" -DestinationPath "lambda-deployment.zip" -Force
+Compress-Archive -Path "main.py", "keywords.json", "requirements.txt", "static" -DestinationPath "lambda-deployment.zip" -Force
 
 # Navigate to terraform directory
 Set-Location "terraform"
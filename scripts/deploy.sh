@@ -19,7 +19,7 @@ echo "🚀 Deploying ${PROJECT_NAME}-${ENVIRONMENT} infrastructure..."
 echo "📦 Creating Lambda deployment package..."
 # Ensure we are in root for zipping
 cd "$(dirname "$0")/.."
-zip -r lambda-deployment.zip main.py requirements.txt static/ -x "**/.*" "**/__pycache__/*"
+zip -r lambda-deployment.zip main.py keywords.json requirements.txt static/ -x "**/.*" "**/__pycache__/*"
 
 # Navigate to terraform directory
 cd terraform